@@ -1,16 +1,36 @@
 import os
 import asyncio
-import json
-from datetime import datetime
-from fastapi import FastAPI, HTTPException, Request
-from fastapi.responses import JSONResponse, HTMLResponse
+import sqlite3
+import struct
+import zlib
+import hashlib
+import heapq
+from collections import OrderedDict, defaultdict
+from datetime import datetime, timedelta
+from itertools import chain
+from operator import attrgetter
+from typing import Literal, Optional
+from fastapi import FastAPI, HTTPException, Query, Request
+from fastapi.responses import JSONResponse, HTMLResponse, Response
 from fastapi.middleware.cors import CORSMiddleware
 from fastapi.templating import Jinja2Templates
-from feed_aggregator import aggregate, aggregate_all, get_feed_stats
+from feed_aggregator import aggregate, aggregate_all, close_session, get_feed_stats
 from pydantic import BaseModel
+import orjson
 import time
 
-app = FastAPI()
+def _dumps(content) -> bytes:
+    return orjson.dumps(content, option=orjson.OPT_NON_STR_KEYS)
+
+
+class ORJSONResponse(JSONResponse):
+    """JSONResponse rendered with orjson, which is much faster on large item lists."""
+
+    def render(self, content) -> bytes:
+        return _dumps(content)
+
+
+app = FastAPI(default_response_class=ORJSONResponse)
 
 # Setup Jinja2 templates
 templates = Jinja2Templates(directory="templates")
@@ -24,64 +44,102 @@ app.add_middleware(
     allow_headers=["*"],
 )
 
-# Simple in-memory cache
-CACHE = {}
-CACHE_TTL = 3600  # 1 hour
+class TTLCache:
+    """Bounded in-memory LRU cache whose entries go stale ``ttl`` seconds after being set."""
 
-# Prefetch configuration
-PREFETCH_INTERVAL_SECONDS = int(os.environ.get("PREFETCH_INTERVAL_SECONDS", 28800))  # 8h default
-PREFETCH = {}
-PREFETCH_TS = 0
+    def __init__(self, maxsize: int, ttl: float):
+        self.maxsize = maxsize
+        self.ttl = ttl
+        self.store = OrderedDict()  # key -> (value, set_time), least recently used first
+
+    def peek(self, key, max_age: float):
+        """Return ``(value, age_seconds)`` for entries younger than ``max_age``, even past ``ttl``.
+
+        Only entries that are returned are promoted in the LRU order; older ones are dropped.
+        """
+        entry = self.store.get(key)
+        if entry is None:
+            return None
+        value, ts = entry
+        age = time.time() - ts
+        if age >= max_age:
+            del self.store[key]
+            return None
+        self.store.move_to_end(key)
+        return value, age
+
+    def set(self, key, value):
+        self.store[key] = (value, time.time())
+        self.store.move_to_end(key)
+        if len(self.store) > self.maxsize:
+            self.store.popitem(last=False)
+
+
+# Per-topic response cache
+CACHE_TTL = 3600  # 1 hour
+CACHE_MAXSIZE = 512
+CACHE = TTLCache(maxsize=CACHE_MAXSIZE, ttl=CACHE_TTL)
+# Expired entries younger than CACHE_TTL + CACHE_STALE_GRACE are served while refreshing
+CACHE_STALE_GRACE = 3 * CACHE_TTL
+# Serialized feed stats appended to topic responses, keyed on the stats dict they encode
+_STATS_CACHE = {"src": None, "v": None}
+# In-flight topic payload builds, keyed by topic; concurrent misses and refreshes share one
+_INFLIGHT = {}
 
-# Daily cache for /all-rss endpoint
+# Daily cache for /all-rss endpoint. Never mutated in place: refreshes rebind the name to a
+# new dict, so readers take one reference and see a consistent snapshot without a lock.
 DAILY_CACHE = {
     'items': [],
     'last_updated': None,
     'count': 0
 }
-# Use asyncio.Lock instead of threading.Lock for async compatibility
-DAILY_CACHE_LOCK = asyncio.Lock()
+# Held while aggregate_all() runs so manual and scheduled refreshes never overlap
+DAILY_REFRESH_LOCK = asyncio.Lock()
 
-# Favorites file path
+# Longest single sleep of the daily scheduler before it re-checks the wall clock
+SCHEDULER_TICK_SECONDS = 300
+
+# Favorites database path (SQLite, WAL mode)
+FAVORITES_DB = "favorites.db"
+# Legacy JSON favorites file, imported into FAVORITES_DB the first time the database is created
 FAVORITES_FILE = "favorites.json"
-# Use asyncio.Lock instead of threading.Lock for async compatibility
+# Serializes use of the shared SQLite connection from worker threads
 FAVORITES_LOCK = asyncio.Lock()
-
-def canonical(s: str) -> str:
-    return s.lower().strip().replace(" ", "-").replace("_", "-")
+_FAV_DB = None
 
 def normalize_topic(topic: str) -> str:
     """Normalize topic by replacing dashes with spaces for keyword matching."""
     return topic.replace('-', ' ')
 
 def filter_and_group_recent(items, cutoff_days=60):
-    from datetime import timedelta
-    cutoff = datetime.now() - timedelta(days=cutoff_days)
-    grouped = {}
+    # FeedItems carry a UTC epoch ts (0 when undated), so this is a plain int comparison
+    cutoff_ts = time.time() - cutoff_days * 86400
+    grouped = defaultdict(list)
     for item in items:
-        pub = item.get("published_parsed")
-        if pub:
-            dt = datetime(*pub[:6])
-            if dt >= cutoff:
-                src = item.get("source", "Unknown")
-                grouped.setdefault(src, []).append(item)
-    return grouped
+        if item.ts >= cutoff_ts:
+            grouped[item.source].append(item)
+    return dict(grouped)
 
 async def refresh_daily_cache():
     """Refresh the daily cache by fetching all RSS feeds."""
     global DAILY_CACHE
-    try:
-        print(f"[{datetime.now()}] Starting daily RSS cache refresh...")
-        items = await aggregate_all()
-        async with DAILY_CACHE_LOCK:
-            DAILY_CACHE['items'] = items
-            DAILY_CACHE['last_updated'] = datetime.now().isoformat()
-            DAILY_CACHE['count'] = len(items)
-        print(f"[{datetime.now()}] Daily cache refresh complete. Total items: {len(items)}")
-    except Exception as e:
-        print(f"[{datetime.now()}] Error refreshing daily cache: {e}")
-        import traceback
-        traceback.print_exc()
+    if DAILY_REFRESH_LOCK.locked():
+        print(f"[{datetime.now()}] Daily RSS cache refresh already running, skipping")
+        return
+    async with DAILY_REFRESH_LOCK:
+        try:
+            print(f"[{datetime.now()}] Starting daily RSS cache refresh...")
+            items = await aggregate_all()
+            DAILY_CACHE = {
+                'items': items,
+                'last_updated': datetime.now().isoformat(),
+                'count': len(items)
+            }
+            print(f"[{datetime.now()}] Daily cache refresh complete. Total items: {len(items)}")
+        except Exception as e:
+            print(f"[{datetime.now()}] Error refreshing daily cache: {e}")
+            import traceback
+            traceback.print_exc()
 
 async def schedule_daily_refresh():
     """Background async task to refresh cache at 1 AM every day."""
@@ -91,12 +149,17 @@ async def schedule_daily_refresh():
         target_time = now.replace(hour=1, minute=0, second=0, microsecond=0)
         if now >= target_time:
             # If it's already past 1 AM today, schedule for tomorrow
-            from datetime import timedelta
             target_time += timedelta(days=1)
         
         sleep_seconds = (target_time - now).total_seconds()
         print(f"[{datetime.now()}] Next cache refresh scheduled at {target_time} (in {sleep_seconds/3600:.2f} hours)")
-        await asyncio.sleep(sleep_seconds)
+        # Sleep in short slices and re-read the wall clock each time, so DST changes,
+        # clock adjustments and host suspend can't push the refresh away from 1 AM
+        while True:
+            remaining = (target_time - datetime.now()).total_seconds()
+            if remaining <= 0:
+                break
+            await asyncio.sleep(min(remaining, SCHEDULER_TICK_SECONDS))
         
         # Refresh the cache
         await refresh_daily_cache()
@@ -115,75 +178,215 @@ async def startup_event():
     await refresh_daily_cache()
     
     # Start background task for daily refresh at 1 AM
-    asyncio.create_task(schedule_daily_refresh())
+    app.state.daily_refresh_task = asyncio.create_task(schedule_daily_refresh())
     
     print(f"[{datetime.now()}] Startup refresh complete and daily scheduler started")
 
+@app.on_event("shutdown")
+async def shutdown_event():
+    """Stop the daily scheduler and close the shared HTTP session and favorites database."""
+    global _FAV_DB
+    task = getattr(app.state, "daily_refresh_task", None)
+    if task is not None:
+        task.cancel()
+    await close_session()
+    if _FAV_DB is not None:
+        _FAV_DB.close()
+        _FAV_DB = None
+
 @app.get("/", response_class=HTMLResponse)
 async def root(request: Request):
     return templates.TemplateResponse("index.html", {"request": request})
 
-async def _handle_topic_request(topic: str):
-    """Shared async logic for both /rss/{topic} and /feed/{topic} endpoints"""
-    topic_key = topic.lower().strip()
+async def _build_topic_payload(topic_key: str):
+    """Build the /rss payload for a topic from a fresh aggregation, and cache it.
+
+    The payload is cached pre-serialized as ``(views, cuts, digest)``, where ``views`` maps
+    each response view ("both", "flat", "grouped") to ``(body, gzip_prefix)``. Only "both"
+    is built up front; the other views are sliced from it at the ``cuts`` offsets when first
+    requested (see ``_view_body``), and a view's gzip prefix stays None until a gzip request
+    for it arrives (see ``_view_gzip_prefix``). ``feed_stats`` is appended per response by
+    ``_topic_response``.
+    """
     # Normalize topic for aggregate function (replace dashes with spaces)
     normalized_topic = normalize_topic(topic_key)
     
-    # Check cache first
-    if topic_key in CACHE:
-        cached_data, cached_time = CACHE[topic_key]
-        if time.time() - cached_time < CACHE_TTL:
-            # Add fresh feed stats to cached response
-            cached_data['feed_stats'] = get_feed_stats()
-            return JSONResponse(content=cached_data)
-    
-    # baseline
-    baseline = None
-    if PREFETCH and (time.time() - PREFETCH_TS) < PREFETCH_INTERVAL_SECONDS * 1.5:
-        # direct hit
-        baseline = PREFETCH.get(topic_key)
-        if not baseline:
-            # try a loose match across prefetched topics
-            key_can = canonical(topic_key)
-            for k, payload in PREFETCH.items():
-                if canonical(k) in key_can or key_can in canonical(k):
-                    baseline = payload
-                    break
+    try:
+        items = await aggregate(normalized_topic)
+    except Exception as e:
+        raise HTTPException(status_code=500, detail=str(e))
+    grouped = filter_and_group_recent(items)
+    flat = list(chain.from_iterable(grouped.values()))
+    topic_name = topic_key
     
-    if baseline:
-        # Use prefetched items but apply 2-month filter again (fresh cutoff)
-        grouped = filter_and_group_recent(baseline.get("items", []))
-        payload = {
-            "topic": baseline.get("topic", topic_key),
-            "count": sum(len(v) for v in grouped.values()),
-            "items": sum(grouped.values(), []),  # flattened list for backward compat
-            "recent_grouped": grouped,
-            "feed_stats": get_feed_stats()
-        }
+    payload = _serialize_topic_payload(topic_name, flat, grouped)
+    CACHE.set(topic_key, payload)
+    return payload
+
+def _serialize_topic_payload(topic_name: str, flat: list, grouped: dict):
+    """Serialize each part of a topic payload once into the "both" body, noting where parts start."""
+    head = _dumps({"topic": topic_name, "count": len(flat)})[:-1]
+    items_json = b',"items":' + _dumps(flat)  # flattened list for backward compat
+    grouped_json = b',"recent_grouped":' + _dumps(grouped)
+    body = head + items_json + grouped_json + b'}'
+    # Offsets of the items and recent_grouped members, for slicing out the other views
+    cuts = (len(head), len(head) + len(items_json))
+    digest = hashlib.blake2b(body, digest_size=16).hexdigest()
+    return {"both": (body, None)}, cuts, digest
+
+def _view_body(views: dict, cuts: tuple, view: str) -> bytes:
+    """Return a view's JSON body, slicing it out of the "both" body the first time it is asked for."""
+    entry = views.get(view)
+    if entry is None:
+        both = views["both"][0]
+        items_at, grouped_at = cuts
+        if view == "flat":
+            body = both[:grouped_at] + b'}'
+        else:  # "grouped"
+            body = both[:items_at] + both[grouped_at:]
+        entry = views[view] = (body, None)
+    return entry[0]
+
+# Fixed gzip member header: deflate, no flags, no mtime, unknown OS
+_GZIP_HEADER = b'\x1f\x8b\x08\x00\x00\x00\x00\x00\x00\xff'
+GZIP_LEVEL = 6
+
+def _gzip_prefix(data: bytes):
+    """Compress ``data`` as the still-open start of a gzip stream.
+
+    Returns ``(compressed, crc32, size)``; ``_gzip_finish`` appends a tail and closes
+    the stream, so cached bodies are compressed once rather than on every response.
+    """
+    comp = zlib.compressobj(GZIP_LEVEL, zlib.DEFLATED, -zlib.MAX_WBITS)
+    compressed = _GZIP_HEADER + comp.compress(data) + comp.flush(zlib.Z_SYNC_FLUSH)
+    return compressed, zlib.crc32(data), len(data)
+
+def _gzip_finish(prefix, tail: bytes) -> bytes:
+    """Append ``tail`` to a ``_gzip_prefix`` result and return the complete gzip body."""
+    compressed, crc, size = prefix
+    # A sync flush leaves the deflate stream byte-aligned without a final block, so a
+    # fresh raw deflate stream for the tail is a valid continuation
+    comp = zlib.compressobj(GZIP_LEVEL, zlib.DEFLATED, -zlib.MAX_WBITS)
+    trailer = struct.pack("<II", zlib.crc32(tail, crc), (size + len(tail)) & 0xFFFFFFFF)
+    return compressed + comp.compress(tail) + comp.flush() + trailer
+
+async def _view_gzip_prefix(views: dict, view: str):
+    """Return the cached gzip prefix for a view, compressing it on first use.
+
+    Everything but the closing brace (where feed_stats gets spliced in) is compressed in a
+    worker thread (zlib releases the GIL, so the event loop keeps running) and stored back
+    into ``views``, so later gzip responses reuse it.
+    """
+    body, prefix = views[view]
+    if prefix is None:
+        prefix = await asyncio.to_thread(_gzip_prefix, body[:-1])
+        views[view] = (body, prefix)
+    return prefix
+
+def _accepts_gzip(accept_encoding: str) -> bool:
+    """Whether an Accept-Encoding header allows gzip (honouring q-values, e.g. ``gzip;q=0``)."""
+    gzip_q = star_q = None
+    for part in accept_encoding.split(","):
+        coding, _, params = part.partition(";")
+        coding = coding.strip().lower()
+        if coding not in ("gzip", "x-gzip", "*"):
+            continue
+        q = 1.0
+        for param in params.split(";"):
+            name, _, value = param.partition("=")
+            if name.strip().lower() == "q":
+                try:
+                    q = float(value)
+                except ValueError:
+                    q = 0.0
+        if coding == "*":
+            star_q = q
+        else:
+            gzip_q = q
+    if gzip_q is None:
+        gzip_q = star_q
+    return gzip_q is not None and gzip_q > 0
+
+def _feed_stats_json() -> bytes:
+    """Serialized feed stats, re-encoded only when an aggregation publishes a new stats dict."""
+    # aggregate() never mutates published stats, it rebinds FEED_STATS to a new dict, so
+    # identity is an exact change check (holding the reference keeps the id from being reused)
+    stats = get_feed_stats()
+    if _STATS_CACHE["src"] is not stats:
+        _STATS_CACHE["v"] = _dumps(stats)
+        _STATS_CACHE["src"] = stats
+    return _STATS_CACHE["v"]
+
+async def _topic_response(request: Request, payload: tuple, view: str) -> Response:
+    """Return 304 if the client already has this payload, else the body with current feed stats."""
+    views, cuts, digest = payload
+    # Weak ETag: the per-response feed_stats tail is not part of the validator
+    etag = f'W/"{digest}-{view}"'
+    headers = {"ETag": etag, "Vary": "Accept-Encoding"}
+    if_none_match = request.headers.get("if-none-match")
+    if if_none_match and (if_none_match.strip() == "*" or etag in (t.strip() for t in if_none_match.split(","))):
+        return Response(status_code=304, headers=headers)
+    # Splice feed_stats into the cached JSON object instead of re-serializing the payload
+    tail = b',"feed_stats":' + _feed_stats_json() + b'}'
+    body = _view_body(views, cuts, view)
+    if _accepts_gzip(request.headers.get("accept-encoding", "")):
+        headers["Content-Encoding"] = "gzip"
+        content = _gzip_finish(await _view_gzip_prefix(views, view), tail)
     else:
-        try:
-            items = await aggregate(normalized_topic)
-        except Exception as e:
-            raise HTTPException(status_code=500, detail=str(e))
-        grouped = filter_and_group_recent(items)
-        payload = {
-            "topic": topic_key,
-            "count": sum(len(v) for v in grouped.values()),
-            "items": sum(grouped.values(), []),
-            "recent_grouped": grouped,
-            "feed_stats": get_feed_stats()
-        }
+        content = body[:-1] + tail
+    return Response(content=content, media_type="application/json", headers=headers)
+
+def _start_topic_build(topic_key: str) -> asyncio.Task:
+    """Return the in-flight payload build for a topic, starting one if none is running.
+
+    ``_INFLIGHT`` holds a reference to the task until it finishes, so background refreshes
+    are not garbage-collected mid-build.
+    """
+    task = _INFLIGHT.get(topic_key)
+    if task is None:
+        task = asyncio.create_task(_build_topic_payload(topic_key))
+        _INFLIGHT[topic_key] = task
+        task.add_done_callback(lambda t: _finish_topic_build(topic_key, t))
+    return task
+
+def _finish_topic_build(topic_key: str, task: asyncio.Task):
+    """Drop a finished build from ``_INFLIGHT`` and log its failure.
+
+    Retrieving the exception here also covers builds nobody awaits any more (background
+    refreshes, or every waiter disconnected from the shielded build).
+    """
+    _INFLIGHT.pop(topic_key, None)
+    if not task.cancelled() and task.exception() is not None:
+        print(f"[{datetime.now()}] Error building topic '{topic_key}': {task.exception()}")
+
+async def _handle_topic_request(topic: str, request: Request, view: str = "both"):
+    """Shared async logic for both /rss/{topic} and /feed/{topic} endpoints.
+
+    ``view`` selects the response shape: "both" (default, ``items`` and
+    ``recent_grouped``), "flat" (``items`` only) or "grouped" (``recent_grouped`` only).
+    """
+    topic_key = topic.lower().strip()
     
-    CACHE[topic_key] = (payload, time.time())
-    return JSONResponse(content=payload)
+    # Check cache first; serve stale entries within the grace window and refresh behind them
+    entry = CACHE.peek(topic_key, CACHE_TTL + CACHE_STALE_GRACE)
+    if entry is not None:
+        payload, age = entry
+        if age >= CACHE_TTL:
+            _start_topic_build(topic_key)
+        return await _topic_response(request, payload, view)
+    
+    # Concurrent misses for the same topic await a single aggregation; shield it so one
+    # disconnecting client does not cancel the build for everyone else
+    payload = await asyncio.shield(_start_topic_build(topic_key))
+    return await _topic_response(request, payload, view)
 
 @app.get("/rss/{topic}")
-async def get_rss(topic: str):
-    return await _handle_topic_request(topic)
+async def get_rss(topic: str, request: Request, view: Literal["both", "flat", "grouped"] = "both"):
+    return await _handle_topic_request(topic, request, view)
 
 @app.get("/feed/{topic}")
-async def get_feed(topic: str):
-    return await _handle_topic_request(topic)
+async def get_feed(topic: str, request: Request, view: Literal["both", "flat", "grouped"] = "both"):
+    return await _handle_topic_request(topic, request, view)
 
 @app.get("/debug/{topic}")
 async def get_debug_stats(topic: str):
@@ -196,45 +399,60 @@ async def get_debug_stats(topic: str):
         items = await aggregate(normalized_topic)
         grouped = filter_and_group_recent(items)
         
-        return JSONResponse(content={
+        return ORJSONResponse(content={
             "topic": topic_key,
             "normalized_topic": normalized_topic,
             "feed_stats": get_feed_stats(),
             "total_items": len(items),
-            "grouped_count": sum(len(v) for v in grouped.values()),
+            "grouped_count": sum(map(len, grouped.values())),
             "recent_grouped": grouped
         })
     except Exception as e:
         raise HTTPException(status_code=500, detail=str(e))
 
 @app.get("/all-rss")
-async def get_all_rss(force_refresh: bool = False):
-    """Get all RSS feed items from daily cache."""
-    global DAILY_CACHE
-    
+async def get_all_rss(force_refresh: bool = False, limit: Optional[int] = Query(None, ge=0)):
+    """Get all RSS feed items from daily cache.
+
+    With ``limit``, only the newest ``limit`` items are returned.
+    """
     # If force_refresh is requested, refresh the cache
     if force_refresh:
         asyncio.create_task(refresh_daily_cache())
     
-    async with DAILY_CACHE_LOCK:
-        return JSONResponse(content={
-            "count": DAILY_CACHE['count'],
-            "items": DAILY_CACHE['items'],
-            "last_updated": DAILY_CACHE['last_updated'],
-            "status": "success"
-        })
+    # One reference read gives a consistent snapshot (refreshes swap the whole dict)
+    cache = DAILY_CACHE
+    items = cache['items']
+    last_updated = cache['last_updated']
+    
+    if limit is not None:
+        # O(n log k) selection instead of sorting the whole cache
+        items = heapq.nlargest(limit, items, key=attrgetter('ts'))
+    return ORJSONResponse(content={
+        "count": len(items),
+        "items": items,
+        "last_updated": last_updated,
+        "status": "success"
+    })
 
 @app.post("/refresh-cache")
 async def manual_refresh_cache():
     """Manually trigger cache refresh."""
-    asyncio.create_task(refresh_daily_cache())
-    async with DAILY_CACHE_LOCK:
-        return JSONResponse(content={
-            "status": "success",
-            "message": "Cache refresh triggered",
-            "last_updated": DAILY_CACHE['last_updated'],
-            "count": DAILY_CACHE['count']
+    cache = DAILY_CACHE
+    if DAILY_REFRESH_LOCK.locked():
+        return ORJSONResponse(content={
+            "status": "already_running",
+            "message": "Cache refresh already in progress",
+            "last_updated": cache['last_updated'],
+            "count": cache['count']
         })
+    asyncio.create_task(refresh_daily_cache())
+    return ORJSONResponse(content={
+        "status": "success",
+        "message": "Cache refresh triggered",
+        "last_updated": cache['last_updated'],
+        "count": cache['count']
+    })
 
 @app.get("/health")
 async def health():
@@ -248,96 +466,151 @@ class FavoriteRequest(BaseModel):
     source: str
     published: str
 
-async def load_favorites():
-    """Load favorites from JSON file."""
-    try:
-        if os.path.exists(FAVORITES_FILE):
-            # Use asyncio to read file (stub - in production, use aiofiles)
-            # For now, keep synchronous file I/O as it's quick
-            with open(FAVORITES_FILE, 'r') as f:
-                return json.load(f)
+_FAVORITE_COLUMNS = ("article_id", "title", "link", "source", "published", "favorited_at")
+
+def _legacy_favorites():
+    """Rows from the legacy favorites.json; an unreadable file is logged and imports nothing."""
+    if not os.path.exists(FAVORITES_FILE):
         return []
+    try:
+        with open(FAVORITES_FILE, 'rb') as f:
+            legacy = orjson.loads(f.read())
+        rows = [tuple(fav.get(c) for c in _FAVORITE_COLUMNS) for fav in legacy]
     except Exception as e:
-        print(f"Error loading favorites: {e}")
+        print(f"Error importing {FAVORITES_FILE}, starting with no favorites: {e}")
         return []
+    # SQLite allows NULL in a TEXT PRIMARY KEY, and such rows could never be unfavorited
+    keyed = [row for row in rows if row[0]]
+    if len(keyed) != len(rows):
+        print(f"Skipping {len(rows) - len(keyed)} favorites without an article_id in {FAVORITES_FILE}")
+    return keyed
 
-async def save_favorites(favorites):
-    """Save favorites to JSON file."""
+def _open_favorites_db():
+    """Open the favorites database, creating the schema and importing favorites.json once."""
+    conn = sqlite3.connect(FAVORITES_DB, check_same_thread=False)
     try:
-        # Use asyncio to write file (stub - in production, use aiofiles)
-        # For now, keep synchronous file I/O as it's quick
-        with open(FAVORITES_FILE, 'w') as f:
-            json.dump(favorites, f, indent=2)
+        conn.row_factory = sqlite3.Row
+        conn.execute("PRAGMA journal_mode=WAL")
+        conn.execute("PRAGMA synchronous=NORMAL")
+        if conn.execute("PRAGMA user_version").fetchone()[0] == 0:
+            with conn:
+                conn.execute(
+                    "CREATE TABLE IF NOT EXISTS favorites ("
+                    "article_id TEXT PRIMARY KEY, title TEXT, link TEXT, source TEXT, "
+                    "published TEXT, favorited_at TEXT)"
+                )
+                conn.executemany(
+                    "INSERT OR IGNORE INTO favorites VALUES (?, ?, ?, ?, ?, ?)",
+                    _legacy_favorites(),
+                )
+                conn.execute("PRAGMA user_version = 1")
+    except Exception:
+        conn.close()
+        raise
+    return conn
+
+async def _favorites_db():
+    global _FAV_DB
+    if _FAV_DB is None:
+        _FAV_DB = await asyncio.to_thread(_open_favorites_db)
+    return _FAV_DB
+
+def _select_favorites(conn):
+    rows = conn.execute("SELECT * FROM favorites ORDER BY rowid").fetchall()
+    return [dict(row) for row in rows]
+
+def _insert_favorite(conn, favorite):
+    with conn:
+        cur = conn.execute(
+            "INSERT OR IGNORE INTO favorites VALUES (?, ?, ?, ?, ?, ?)",
+            tuple(favorite[c] for c in _FAVORITE_COLUMNS),
+        )
+    return cur.rowcount > 0
+
+def _delete_favorite(conn, article_id):
+    with conn:
+        cur = conn.execute("DELETE FROM favorites WHERE article_id = ?", (article_id,))
+    return cur.rowcount > 0
+
+async def load_favorites():
+    """Load all favorites, oldest first."""
+    try:
+        conn = await _favorites_db()
+        return await asyncio.to_thread(_select_favorites, conn)
     except Exception as e:
-        print(f"Error saving favorites: {e}")
-        raise HTTPException(status_code=500, detail="Failed to save favorites")
+        print(f"Error loading favorites: {e}")
+        return []
 
 @app.get("/favorites")
 async def get_favorites():
     """Get all favorite articles for the user."""
     async with FAVORITES_LOCK:
         favorites = await load_favorites()
-        return JSONResponse(content={
-            "status": "success",
-            "count": len(favorites),
-            "favorites": favorites
-        })
+    return ORJSONResponse(content={
+        "status": "success",
+        "count": len(favorites),
+        "favorites": favorites
+    })
 
 @app.post("/favorite")
 async def add_favorite(request: FavoriteRequest):
     """Add an article to favorites."""
+    new_favorite = {
+        "article_id": request.article_id,
+        "title": request.title,
+        "link": request.link,
+        "source": request.source,
+        "published": request.published,
+        "favorited_at": datetime.now().isoformat()
+    }
     async with FAVORITES_LOCK:
-        favorites = await load_favorites()
-        
-        # Check if article is already favorited
-        if any(fav['article_id'] == request.article_id for fav in favorites):
-            return JSONResponse(content={
-                "status": "already_exists",
-                "message": "Article is already in favorites"
-            })
-        
-        # Add new favorite
-        new_favorite = {
-            "article_id": request.article_id,
-            "title": request.title,
-            "link": request.link,
-            "source": request.source,
-            "published": request.published,
-            "favorited_at": datetime.now().isoformat()
-        }
-        favorites.append(new_favorite)
-        await save_favorites(favorites)
-        
-        return JSONResponse(content={
-            "status": "success",
-            "message": "Article added to favorites",
-            "favorite": new_favorite
+        try:
+            conn = await _favorites_db()
+            inserted = await asyncio.to_thread(_insert_favorite, conn, new_favorite)
+        except Exception as e:
+            print(f"Error saving favorites: {e}")
+            raise HTTPException(status_code=500, detail="Failed to save favorites")
+    
+    # Check if article was already favorited
+    if not inserted:
+        return ORJSONResponse(content={
+            "status": "already_exists",
+            "message": "Article is already in favorites"
         })
+    
+    return ORJSONResponse(content={
+        "status": "success",
+        "message": "Article added to favorites",
+        "favorite": new_favorite
+    })
 
 @app.post("/unfavorite")
 async def remove_favorite(request: FavoriteRequest):
     """Remove an article from favorites."""
     async with FAVORITES_LOCK:
-        favorites = await load_favorites()
-        
-        # Find and remove the favorite
-        initial_count = len(favorites)
-        favorites = [fav for fav in favorites if fav['article_id'] != request.article_id]
-        
-        if len(favorites) == initial_count:
-            return JSONResponse(content={
-                "status": "not_found",
-                "message": "Article not found in favorites"
-            })
-        
-        await save_favorites(favorites)
-        
-        return JSONResponse(content={
-            "status": "success",
-            "message": "Article removed from favorites"
+        try:
+            conn = await _favorites_db()
+            deleted = await asyncio.to_thread(_delete_favorite, conn, request.article_id)
+        except Exception as e:
+            print(f"Error saving favorites: {e}")
+            raise HTTPException(status_code=500, detail="Failed to save favorites")
+    
+    if not deleted:
+        return ORJSONResponse(content={
+            "status": "not_found",
+            "message": "Article not found in favorites"
         })
+    
+    return ORJSONResponse(content={
+        "status": "success",
+        "message": "Article removed from favorites"
+    })
 
 if __name__ == "__main__":
     import uvicorn
     port = int(os.environ.get("PORT", 8000))
-    uvicorn.run(app, host="0.0.0.0", port=port)
+    # CACHE and DAILY_CACHE are per process, so each extra worker keeps its own copy (and
+    # runs its own startup refresh); default to a single worker. Favorites live in the
+    # shared SQLite file, so they stay consistent across workers
+    workers = int(os.environ.get("WEB_CONCURRENCY", 1))
+    uvicorn.run("app:app", host="0.0.0.0", port=port, loop="uvloop", http="httptools", workers=workers)
@@ -1,20 +1,56 @@
 """Feed aggregator module for physics RSS feeds."""
+import asyncio
+import aiohttp
+import calendar
 import feedparser
-import requests
-from datetime import datetime, timedelta
+import time
 import yaml
-from typing import Dict, List, Any
+from typing import Dict, List, Any, Optional, Tuple
 import re
 import logging
+import os
+from dataclasses import dataclass
+from functools import lru_cache
+from operator import attrgetter
 from urllib.parse import urlparse
 
 # Set up logging
 logging.basicConfig(level=logging.INFO)
 logger = logging.getLogger(__name__)
 
+@dataclass(slots=True)
+class FeedItem:
+    """One aggregated entry; orjson serializes it as the same JSON object the item dicts produced."""
+    title: str
+    abstract: str
+    source: str
+    published: str  # naive UTC ISO string, '' when undated
+    link: str
+    ts: int  # UTC epoch sort key, 0 when undated
+
+
 # Global stats for debugging
 FEED_STATS = {}
 
+# Shared HTTP session so feed hosts keep their connections (and DNS) across aggregations
+_SESSION: Optional[aiohttp.ClientSession] = None
+FETCH_TIMEOUT_SECONDS = 15
+# Cap on concurrent upstream feed requests
+_FETCH_SEMAPHORE = asyncio.Semaphore(16)
+
+# Conditional GET cache: feed URL -> (ETag, Last-Modified, parsed feed)
+FEED_CACHE: Dict[str, Tuple[Optional[str], Optional[str], feedparser.FeedParserDict]] = {}
+
+# Feed configuration, re-parsed only when the file's mtime changes
+FEEDS_FILE = 'feeds.yaml'
+_FEEDS_CACHE: Dict[str, Any] = {'mtime': None, 'data': None}
+# Prefer libyaml's C loader when PyYAML was built with it
+_YAML_LOADER = getattr(yaml, 'CSafeLoader', yaml.SafeLoader)
+
+# Keyword patterns for the combined quantum-networks + ion/atom topic
+_RE_QNET = re.compile(r'quantum\s+network')
+_RE_ION_COMBINED = re.compile(r'\b(?:ion|atom|atomic)\s+(?:trap|qubit)|trapped[\s-](?:ion|atom)')
+
 # Feed URL to source/journal name mapping
 # Normalized URLs (without protocol, lowercase) to journal labels
 FEED_URL_TO_SOURCE = {
@@ -48,8 +84,9 @@ def normalize_feed_url(url: str) -> str:
     return f"{parsed.netloc}{path}"
 
 
-def get_source_from_url(feed_url: str, feed_obj) -> str:
-    """Get source name from URL mapping or fall back to feed title."""
+@lru_cache(maxsize=256)
+def mapped_source(feed_url: str) -> Optional[str]:
+    """Return the FEED_URL_TO_SOURCE name for a feed URL, or None (memoized per URL)."""
     normalized_url = normalize_feed_url(feed_url)
 
     # Try exact match first
@@ -64,58 +101,178 @@ def get_source_from_url(feed_url: str, feed_obj) -> str:
     if normalized_url.rstrip('/') in FEED_URL_TO_SOURCE:
         return FEED_URL_TO_SOURCE[normalized_url.rstrip('/')]
 
+    return None
+
+
+def get_source_from_url(feed_url: str, feed_obj) -> str:
+    """Get source name from URL mapping or fall back to feed title."""
+    source = mapped_source(feed_url)
+    if source is not None:
+        return source
+
     # Fallback to feed title or Unknown
     return feed_obj.feed.get('title', 'Unknown') if hasattr(feed_obj, 'feed') else 'Unknown'
 
 
+def load_feeds_config() -> Dict[str, Any]:
+    """Return the parsed feeds.yaml, cached until the file changes (raises FileNotFoundError)."""
+    mtime = os.stat(FEEDS_FILE).st_mtime_ns
+    if _FEEDS_CACHE['mtime'] != mtime:
+        with open(FEEDS_FILE, 'r') as f:
+            _FEEDS_CACHE['data'] = yaml.load(f, Loader=_YAML_LOADER) or {}
+        _FEEDS_CACHE['mtime'] = mtime
+    return _FEEDS_CACHE['data']
+
+
+def get_session() -> aiohttp.ClientSession:
+    """Return the shared aiohttp session, creating it on first use."""
+    global _SESSION
+    if _SESSION is None or _SESSION.closed:
+        _SESSION = aiohttp.ClientSession(
+            connector=aiohttp.TCPConnector(limit=64, ttl_dns_cache=600, keepalive_timeout=75),
+            timeout=aiohttp.ClientTimeout(total=FETCH_TIMEOUT_SECONDS),
+        )
+    return _SESSION
+
+
+async def close_session() -> None:
+    """Close the shared aiohttp session (called on application shutdown)."""
+    global _SESSION
+    if _SESSION is not None and not _SESSION.closed:
+        await _SESSION.close()
+    _SESSION = None
+
+
+async def fetch_feed(
+    session: aiohttp.ClientSession, feed_url: str
+) -> Tuple[int, Optional[feedparser.FeedParserDict]]:
+    """
+    Fetch and parse a feed, revalidating with ETag/Last-Modified when possible.
+
+    Returns the HTTP status and the parsed feed. On 304 Not Modified the
+    previously parsed feed is returned without re-parsing; on any other
+    non-200 status the parsed feed is None.
+    """
+    cached = FEED_CACHE.get(feed_url)
+    headers = {}
+    if cached:
+        etag, last_modified, _ = cached
+        if etag:
+            headers['If-None-Match'] = etag
+        if last_modified:
+            headers['If-Modified-Since'] = last_modified
+
+    async with _FETCH_SEMAPHORE:
+        async with session.get(feed_url, headers=headers) as resp:
+            if resp.status == 304 and cached:
+                return resp.status, cached[2]
+            if resp.status != 200:
+                return resp.status, None
+            content = await resp.read()
+            etag = resp.headers.get('ETag')
+            last_modified = resp.headers.get('Last-Modified')
+
+    # feedparser is CPU-bound pure Python; parse in a worker thread so the event
+    # loop keeps serving requests and other feeds' downloads meanwhile.
+    feed = await asyncio.to_thread(feedparser.parse, content)
+    if etag or last_modified:
+        FEED_CACHE[feed_url] = (etag, last_modified, feed)
+    else:
+        # No validators any more: drop the old entry so we stop sending stale conditionals
+        FEED_CACHE.pop(feed_url, None)
+    return resp.status, feed
+
+
+def entry_timestamp(entry) -> Optional[int]:
+    """Return the entry's published (or updated) time as a UTC epoch from feedparser's parsed tuple."""
+    parsed = entry.get('published_parsed') or entry.get('updated_parsed')
+    if not parsed:
+        return None
+    try:
+        return calendar.timegm(parsed)
+    except (TypeError, ValueError, OverflowError):
+        return None
+
+
+def format_timestamp(ts: Optional[int]) -> str:
+    """Format an epoch as the naive ISO string used for 'published' ('' when undated)."""
+    return time.strftime('%Y-%m-%dT%H:%M:%S', time.gmtime(ts)) if ts is not None else ''
+
+
 # Consistent date window for all aggregations
-DAYS_30_AGO = datetime.now() - timedelta(days=30)
+DATE_WINDOW_DAYS = 30
+
+
+def date_cutoff() -> int:
+    """Return the epoch before which entries fall outside the date window."""
+    return int(time.time()) - DATE_WINDOW_DAYS * 86400
+
+
+# In-window entries a newest-first feed must yield before its first old entry ends the scan
+EARLY_STOP_MIN_IN_WINDOW = 3
+
+
+def is_newest_first(entries) -> bool:
+    """Guess whether a feed lists entries newest-first from its first, second and last timestamps."""
+    if len(entries) < 3:
+        return False
+    stamps = [entry_timestamp(entries[0]), entry_timestamp(entries[1]), entry_timestamp(entries[-1])]
+    return None not in stamps and stamps[0] >= stamps[1] >= stamps[2]
 
 
-async def aggregate(topic: str) -> List[Dict[str, Any]]:
+async def aggregate(topic: str, session: Optional[aiohttp.ClientSession] = None) -> List[FeedItem]:
     """
     Aggregate RSS feeds for a given topic.
 
     Args:
         topic: The topic to aggregate feeds for (e.g., 'ion-trap', 'quantum-networks')
+        session: HTTP session to fetch with (defaults to the shared session)
 
     Returns:
-        list: List of feed items with title, abstract, source, and date
+        list: FeedItems with title, abstract, source, and date
     """
     global FEED_STATS
-    FEED_STATS = {}  # Reset stats for each request
+    # Stats for this request are built locally and published in one rebind at the end,
+    # so concurrent aggregations never mix entries in the dict get_feed_stats() returns
+    feed_stats = {}
 
     logger.info(f"Starting aggregation for topic: {topic}")
 
     # Replace dashes with spaces in topic for better keyword matching
     normalized_topic = topic.replace('-', ' ')
-    logger.info(f"Normalized topic: '{topic}' -> '{normalized_topic}'")
+    logger.debug("Normalized topic: '%s' -> '%s'", topic, normalized_topic)
 
     # Load feeds from feeds.yaml
     try:
-        with open('feeds.yaml', 'r') as f:
-            feeds_config = yaml.safe_load(f)
+        feeds_config = load_feeds_config()
     except FileNotFoundError:
         logger.error("feeds.yaml not found")
+        FEED_STATS = feed_stats  # nothing fetched: don't leave the previous run's stats
         return []
 
     # Get feeds from 'normal_feeds' key in YAML config
     topic_feeds = feeds_config.get('normal_feeds', [])
     if not topic_feeds:
         logger.error("No normal_feeds found in feeds.yaml")
+        FEED_STATS = feed_stats
         return []
 
     logger.info(f"Found {len(topic_feeds)} RSS feeds to process")
+    session = session or get_session()
 
     # Use a consistent 30-day threshold
-    days_30_ago = DAYS_30_AGO
-    logger.info(f"Date filter threshold (30 days): {days_30_ago}")
+    cutoff_ts = date_cutoff()
+    logger.debug("Date filter threshold (30 days): %s", format_timestamp(cutoff_ts))
 
     results = []
     total_raw_items = 0
     total_date_filtered = 0
     total_keyword_filtered = 0
     total_final_items = 0
+    total_duplicates = 0
+
+    # Entry ids/links already collected, so papers cross-listed in several feeds appear once
+    seen = set()
 
     # DEBUG: Track items per journal/source
     journal_item_counts = {}
@@ -124,34 +281,37 @@ async def aggregate(topic: str) -> List[Dict[str, Any]]:
     is_quantum_networks_combined = 'quantum networks' in normalized_topic.lower() and (
         'ion' in normalized_topic.lower() or 'atom' in normalized_topic.lower()
     )
-    logger.info(f"Is quantum networks combined topic: {is_quantum_networks_combined}")
+    logger.debug("Is quantum networks combined topic: %s", is_quantum_networks_combined)
+
+    # Fetch all feeds concurrently (bounded by _FETCH_SEMAPHORE), then process in config order
+    responses = await asyncio.gather(
+        *(fetch_feed(session, feed_url) for feed_url in topic_feeds), return_exceptions=True
+    )
 
     # Process each feed
-    for i, feed_url in enumerate(topic_feeds, 1):
-        feed_name = feed_url.split('/')[-1] if '/' in feed_url else feed_url
-        logger.info(f"\n[{i}/{len(topic_feeds)}] Processing feed: {feed_name}")
-        logger.info(f"URL: {feed_url}")
+    for i, (feed_url, response) in enumerate(zip(topic_feeds, responses), 1):
+        feed_name = feed_url.rsplit('/', 1)[-1]
+        logger.debug("[%d/%d] Processing feed: %s (%s)", i, len(topic_feeds), feed_name, feed_url)
 
         try:
-            # Fetch and parse the feed
-            response = requests.get(feed_url, timeout=15)
+            if isinstance(response, BaseException):
+                raise response
+            status, feed = response
 
-            # DEBUG: Log HTTP status BEFORE filtering
-            logger.info(f"DEBUG: HTTP Status: {response.status_code}")
+            logger.debug("HTTP Status: %s", status)
 
-            if response.status_code != 200:
-                logger.warning(f"HTTP error {response.status_code} for {feed_url}")
-                FEED_STATS[feed_name] = {
-                    'status': f'HTTP {response.status_code}',
+            if feed is None:
+                logger.warning(f"HTTP error {status} for {feed_url}")
+                feed_stats[feed_name] = {
+                    'status': f'HTTP {status}',
                     'raw_items': 0,
                     'date_filtered': 0,
                     'keyword_filtered': 0,
+                    'duplicates': 0,
                     'final_items': 0,
                 }
                 continue
 
-            feed = feedparser.parse(response.content)
-
             # Check for RSS parsing errors
             if hasattr(feed, 'bozo') and feed.bozo:
                 logger.warning(
@@ -164,16 +324,13 @@ async def aggregate(topic: str) -> List[Dict[str, Any]]:
             # Get source name using URL mapping
             source = get_source_from_url(feed_url, feed)
 
-            # DEBUG: Log feed URL mapping and raw entries BEFORE filtering
-            logger.info(f"DEBUG: Feed URL maps to journal: '{source}'")
-            logger.info(f"DEBUG: Number of raw entries after parsing: {raw_items}")
+            logger.debug("Feed URL maps to journal '%s' with %d raw entries", source, raw_items)
 
-            # DEBUG: Print first 2 titles from non-arXiv feeds
-            if 'arxiv' not in source.lower():
-                logger.info(f"DEBUG: Sample titles from '{source}':")
+            # Print first 2 titles from non-arXiv feeds
+            if logger.isEnabledFor(logging.DEBUG) and 'arxiv' not in source.lower():
+                logger.debug("Sample titles from '%s':", source)
                 for idx, entry in enumerate(feed.entries[:2]):
-                    title = entry.get('title', 'No title')
-                    logger.info(f"  [{idx + 1}] {title}")
+                    logger.debug("  [%d] %s", idx + 1, entry.get('title', 'No title'))
 
             # Initialize counter for this journal
             if source not in journal_item_counts:
@@ -181,20 +338,28 @@ async def aggregate(topic: str) -> List[Dict[str, Any]]:
 
             date_filtered_count = 0
             keyword_filtered_count = 0
-            final_count = 0
+            duplicate_count = 0
+
+            entries = feed.entries
+            newest_first = is_newest_first(entries)
+            in_window = 0
+            # Collect this feed's items locally and extend results once at the end
+            feed_items = []
+            feed_append = feed_items.append
 
-            for entry in feed.entries:
+            for idx, entry in enumerate(entries):
                 # Extract published date
-                pub_date = None
-                if hasattr(entry, 'published_parsed') and entry.published_parsed:
-                    pub_date = datetime(*entry.published_parsed[:6])
-                elif hasattr(entry, 'updated_parsed') and entry.updated_parsed:
-                    pub_date = datetime(*entry.updated_parsed[:6])
+                ts = entry_timestamp(entry)
 
                 # Filter by date (consistent 30-day window)
-                if pub_date and pub_date < days_30_ago:
+                if ts is not None and ts < cutoff_ts:
+                    if newest_first and in_window >= EARLY_STOP_MIN_IN_WINDOW:
+                        # Sorted feed: everything from here on is older, count it as filtered
+                        date_filtered_count += len(entries) - idx
+                        break
                     date_filtered_count += 1
                     continue
+                in_window += 1
 
                 # Extract data
                 title = entry.get('title', '')
@@ -203,64 +368,83 @@ async def aggregate(topic: str) -> List[Dict[str, Any]]:
                 # Apply keyword filtering for combined topics
                 if is_quantum_networks_combined:
                     text_to_search = (title + ' ' + abstract).lower()
-                    has_quantum_network = bool(re.search(r'quantum\s+network', text_to_search))
-                    has_ion_or_atom = bool(
-                        re.search(r'\b(ion|atom|atomic)\s+(trap|qubit)', text_to_search)
-                    ) or bool(re.search(r'trapped[\s-](ion|atom)', text_to_search))
-
-                    if not (has_quantum_network and has_ion_or_atom):
+                    # Cheap substring prefilter: every match needs these words, so most
+                    # entries are rejected before the regex engine runs. Then test the
+                    # rarer "quantum network" phrase before the ion/atom alternation.
+                    matches = (
+                        'network' in text_to_search
+                        and 'quantum' in text_to_search
+                        and ('ion' in text_to_search or 'atom' in text_to_search)
+                        and bool(_RE_QNET.search(text_to_search))
+                        and bool(_RE_ION_COMBINED.search(text_to_search))
+                    )
+
+                    if not matches:
                         keyword_filtered_count += 1
                         continue
 
+                # Skip entries already collected from an earlier feed
+                key = entry.get('id') or entry.get('link') or (title, ts)
+                if key in seen:
+                    duplicate_count += 1
+                    continue
+                seen.add(key)
+
                 # Include item if within 30 days or missing date
-                include_in_results = not pub_date or pub_date >= days_30_ago
-
-                item = {
-                    'title': title,
-                    'abstract': abstract,
-                    'source': source,  # Use the mapped source from URL
-                    'published': pub_date.isoformat() if pub_date else '',
-                    'link': entry.get('link', ''),
-                    'published_parsed': entry.get('published_parsed', None),
-                }
+                include_in_results = ts is None or ts >= cutoff_ts
+
+                item = FeedItem(
+                    title,
+                    abstract,
+                    source,  # Use the mapped source from URL
+                    format_timestamp(ts),
+                    entry.get('link', ''),
+                    ts if ts is not None else 0,
+                )
 
                 if include_in_results:
-                    results.append(item)
-                    final_count += 1
-                    journal_item_counts[source] += 1
+                    feed_append(item)
+
+            final_count = len(feed_items)
+            results.extend(feed_items)
+            journal_item_counts[source] += final_count
 
             # Store feed statistics
-            FEED_STATS[feed_name] = {
+            feed_stats[feed_name] = {
                 'status': 'SUCCESS',
                 'raw_items': raw_items,
                 'date_filtered': date_filtered_count,
                 'keyword_filtered': keyword_filtered_count,
+                'duplicates': duplicate_count,
                 'final_items': final_count,
             }
 
             total_date_filtered += date_filtered_count
             total_keyword_filtered += keyword_filtered_count
+            total_duplicates += duplicate_count
             total_final_items += final_count
 
-            logger.info("Feed processing complete:")
-            logger.info(f"  - Raw items: {raw_items}")
-            logger.info(f"  - Date filtered (30d): {date_filtered_count}")
-            logger.info(f"  - Keyword filtered: {keyword_filtered_count}")
-            logger.info(f"  - Final items (30d): {final_count}")
+            logger.debug(
+                "Feed processing complete: raw=%d date_filtered(30d)=%d keyword_filtered=%d duplicates=%d final(30d)=%d",
+                raw_items, date_filtered_count, keyword_filtered_count, duplicate_count, final_count,
+            )
 
         except Exception as e:
             logger.error(f"Error fetching feed {feed_url}: {e}")
-            FEED_STATS[feed_name] = {
+            feed_stats[feed_name] = {
                 'status': f'ERROR: {str(e)}',
                 'raw_items': 0,
                 'date_filtered': 0,
                 'keyword_filtered': 0,
+                'duplicates': 0,
                 'final_items': 0,
             }
             continue
 
+    FEED_STATS = feed_stats
+
     # Sort by date (newest first)
-    results.sort(key=lambda x: x.get('published', ''), reverse=True)
+    results.sort(key=attrgetter('ts'), reverse=True)
 
     # Log final summary
     logger.info("\n=== AGGREGATION SUMMARY ===")
@@ -269,26 +453,26 @@ async def aggregate(topic: str) -> List[Dict[str, Any]]:
     logger.info(f"Total raw items: {total_raw_items}")
     logger.info(f"Date filtered out (30d): {total_date_filtered}")
     logger.info(f"Keyword filtered out: {total_keyword_filtered}")
+    logger.info(f"Duplicates skipped: {total_duplicates}")
     logger.info(f"Final items (30d): {total_final_items}")
 
-    # DEBUG: Print items found per journal/source
-    logger.info("\n=== ITEMS PER JOURNAL/SOURCE ===")
-    for journal, count in sorted(journal_item_counts.items(), key=lambda x: x[1], reverse=True):
-        logger.info(f"  {journal}: {count} items")
-    logger.info("============================\n")
+    # Print items found per journal/source
+    if logger.isEnabledFor(logging.DEBUG):
+        logger.debug("=== ITEMS PER JOURNAL/SOURCE ===")
+        for journal, count in sorted(journal_item_counts.items(), key=lambda x: x[1], reverse=True):
+            logger.debug("  %s: %d items", journal, count)
 
     return results
 
 
-async def aggregate_all() -> List[Dict[str, Any]]:
+async def aggregate_all(session: Optional[aiohttp.ClientSession] = None) -> List[FeedItem]:
     """
     Aggregate all feeds and return a flat list of items.
     Applies the same consistent 30-day date filter used elsewhere.
     """
     logger.info("Starting aggregate_all: loading feeds.yaml and fetching all normal_feeds")
     try:
-        with open('feeds.yaml', 'r') as f:
-            feeds_config = yaml.safe_load(f)
+        feeds_config = load_feeds_config()
     except FileNotFoundError:
         logger.error("feeds.yaml not found")
         return []
@@ -298,45 +482,58 @@ async def aggregate_all() -> List[Dict[str, Any]]:
         logger.error("No normal_feeds found in feeds.yaml")
         return []
 
-    results: List[Dict[str, Any]] = []
-    days_30_ago = DAYS_30_AGO
+    results: List[FeedItem] = []
+    seen = set()
+    cutoff_ts = date_cutoff()
+    session = session or get_session()
 
-    for i, feed_url in enumerate(feed_urls, 1):
-        feed_name = feed_url.split('/')[-1] if '/' in feed_url else feed_url
-        logger.info(f"[aggregate_all] [{i}/{len(feed_urls)}] Fetching: {feed_name} -> {feed_url}")
+    responses = await asyncio.gather(
+        *(fetch_feed(session, feed_url) for feed_url in feed_urls), return_exceptions=True
+    )
+
+    for i, (feed_url, response) in enumerate(zip(feed_urls, responses), 1):
+        feed_name = feed_url.rsplit('/', 1)[-1]
+        logger.debug("[aggregate_all] [%d/%d] Fetched: %s -> %s", i, len(feed_urls), feed_name, feed_url)
         try:
-            resp = requests.get(feed_url, timeout=15)
-            if resp.status_code != 200:
-                logger.warning(f"[aggregate_all] HTTP {resp.status_code} for {feed_url}")
+            if isinstance(response, BaseException):
+                raise response
+            status, parsed = response
+            if parsed is None:
+                logger.warning(f"[aggregate_all] HTTP {status} for {feed_url}")
                 continue
-            parsed = feedparser.parse(resp.content)
             source_name = get_source_from_url(feed_url, parsed)
-            for entry in getattr(parsed, 'entries', []):
+            entries = getattr(parsed, 'entries', [])
+            newest_first = is_newest_first(entries)
+            in_window = 0
+            feed_items = []
+            feed_append = feed_items.append
+            for entry in entries:
                 # Parse published/updated date
-                pub_dt = None
-                if hasattr(entry, 'published_parsed') and entry.published_parsed:
-                    try:
-                        pub_dt = datetime(*entry.published_parsed[:6])
-                    except Exception:
-                        pub_dt = None
-                elif hasattr(entry, 'updated_parsed') and entry.updated_parsed:
-                    try:
-                        pub_dt = datetime(*entry.updated_parsed[:6])
-                    except Exception:
-                        pub_dt = None
+                ts = entry_timestamp(entry)
 
                 # Enforce consistent 30-day filter
-                if pub_dt and pub_dt < days_30_ago:
+                if ts is not None and ts < cutoff_ts:
+                    if newest_first and in_window >= EARLY_STOP_MIN_IN_WINDOW:
+                        break
                     continue
+                in_window += 1
 
-                item = {
-                    'title': entry.get('title', ''),
-                    'abstract': entry.get('summary', '') or entry.get('description', ''),
-                    'source': source_name,
-                    'published': pub_dt.isoformat() if pub_dt else '',
-                    'link': entry.get('link', ''),
-                }
-                results.append(item)
+                title = entry.get('title', '')
+                key = entry.get('id') or entry.get('link') or (title, ts)
+                if key in seen:
+                    continue
+                seen.add(key)
+
+                item = FeedItem(
+                    title,
+                    entry.get('summary', '') or entry.get('description', ''),
+                    source_name,
+                    format_timestamp(ts),
+                    entry.get('link', ''),
+                    ts if ts is not None else 0,
+                )
+                feed_append(item)
+            results.extend(feed_items)
         except Exception as e:
             logger.error(f"[aggregate_all] Error fetching {feed_url}: {e}")
             continue